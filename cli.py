@@ -9,9 +9,14 @@ Usage:
     python cli.py --from-file urls.txt
     python cli.py <url> --author "Name" --topic "Subject" --year "2024"
     python cli.py <url> --output-dir ~/transcripts
+    python cli.py <url> --no-cache
 """
 import sys
 import argparse
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to path for imports
@@ -21,9 +26,14 @@ sys.path.insert(0, str(PROJECT_ROOT))
 import json
 
 from src.core.models import VideoMeta
-from src.core.downloader import extract_video_id, fetch_metadata, fetch_transcript
-from src.core.writers import write_markdown, write_docx, write_json
-from src.utils.filename import build_filename, build_output_path
+from src.core.downloader import (
+    HAS_YT_DLP_LIB,
+    extract_video_id,
+    ydl_session,
+)
+from src.core.async_downloader import fetch_video_async, fetch_video_batch_async
+from src.core.writers import write_markdown, write_docx, write_json, normalize_transcript
+from src.utils.filename import build_filename, build_output_path, unique_batch_filenames
 
 # Try to import shared utilities
 try:
@@ -35,37 +45,41 @@ except ImportError:
             return json.load(f)
 
     def expand_path(path):
-        import os
         return Path(os.path.expanduser(str(path))).resolve()
 
+# settings.json is read by every worker; parse it once per run
+_load_config_cached = functools.lru_cache(maxsize=8)(load_config)
+
 
 def load_output_base(override=None):
     """Resolve output directory from override or config."""
     if override:
         return str(expand_path(override))
-    config = load_config("settings", PROJECT_ROOT / "config")
+    config = _load_config_cached("settings", PROJECT_ROOT / "config")
     return config.get("output_base", "~/transcripts")
 
 
-def process_single(url, output_base, author_override=None, topic_override=None,
-                    year_override=None, include_links=True):
+def dedupe_urls(urls):
     """
-    Process a single URL through the v2 pipeline.
-    Returns True on success, False on failure.
+    Drop URLs that point at a video already in the list, keeping the first.
+    Two tasks for one video would write the same output files concurrently.
+    Invalid URLs are kept so they are still reported as failures.
+    Returns (unique_urls, skipped_duplicates).
     """
-    vid = extract_video_id(url)
-    if not vid:
-        print(f"ERROR: Invalid YouTube URL: {url}", file=sys.stderr)
-        return False
+    seen = set()
+    unique, duplicates = [], []
+    for url in urls:
+        vid = extract_video_id(url)
+        if vid and vid in seen:
+            duplicates.append(url)
+            continue
+        seen.add(vid)
+        unique.append(url)
+    return unique, duplicates
 
-    # Fetch metadata
-    print(f"Fetching metadata: {url}")
-    video = fetch_metadata(url)
-    if not video:
-        print(f"ERROR: Could not fetch metadata for {url}", file=sys.stderr)
-        return False
 
-    # Apply overrides
+def apply_overrides(video, author_override=None, topic_override=None, year_override=None):
+    """Replace proposed naming values with any non-empty overrides."""
     if author_override:
         video.proposed_author = author_override
     if topic_override:
@@ -73,37 +87,127 @@ def process_single(url, output_base, author_override=None, topic_override=None,
     if year_override:
         video.proposed_year = year_override
 
-    # Fetch transcript
-    print(f"Fetching transcript: {video.title}")
-    video = fetch_transcript(video, include_links=include_links)
-
-    # Build filename
-    config = load_config("settings", PROJECT_ROOT / "config")
-    max_length = config.get("filename_max_length", 50)
-    filename = build_filename(
-        video.proposed_author,
-        video.proposed_topic,
-        video.proposed_year,
-        max_length=max_length
-    )
 
-    # Write all three formats
+def save_video(video, output_base, filename):
+    """
+    Write all three output formats for a fetched video.
+    filename is the base name from unique_batch_filenames.
+    Returns the written paths (md, docx, json).
+    """
+    # Write all three formats (transcript normalized once, shared by md and docx)
+    entries = normalize_transcript(video.transcript)
+
     md_path = build_output_path(output_base, video.proposed_author, filename, "md")
-    write_markdown(video, md_path)
+    write_markdown(video, md_path, entries)
 
     docx_path = build_output_path(output_base, video.proposed_author, filename, "docx")
-    write_docx(video, docx_path)
+    write_docx(video, docx_path, entries)
 
     json_path = build_output_path(output_base, video.proposed_author, filename, "json")
     write_json(video, json_path)
 
-    print(f"Saved: {md_path}")
-    print(f"Saved: {docx_path}")
-    print(f"Saved: {json_path}")
+    return [md_path, docx_path, json_path]
+
 
+async def save_single_async(video, output_base, filename):
+    """
+    Run save_video in a worker thread, then report its files.
+    Printing here, on the event loop, keeps each line whole; print()
+    from concurrent threads interleaves text and newlines.
+    Returns True on success.
+    """
+    for path in await asyncio.to_thread(save_video, video, output_base, filename):
+        print(f"Saved: {path}")
     return True
 
 
+async def fetch_single_async(url, sem, include_links=True, use_cache=True, video=None,
+                             session=None, fetch=True):
+    """
+    Fetch one URL through the v2 pipeline, under the semaphore.
+    If video is given (already fetched by fetch_video_batch_async), it is returned as is.
+    fetch=False: the prefetch already tried this URL, so a missing video is a failure.
+    Returns VideoMeta, or None on failure.
+    """
+    vid = extract_video_id(url)
+    if not vid:
+        print(f"ERROR: Invalid YouTube URL: {url}", file=sys.stderr)
+        return None
+
+    if video is None and fetch:
+        async with sem:
+            # Fetch metadata and transcript in one yt-dlp call
+            print(f"Fetching video: {url}")
+            video = await fetch_video_async(url, include_links=include_links,
+                                            use_cache=use_cache, session=session)
+    if not video:
+        print(f"ERROR: Could not fetch metadata for {url}", file=sys.stderr)
+        return None
+
+    return video
+
+
+async def run_batch(urls, output_base, max_workers, prefetch=False, include_links=True,
+                    use_cache=True, author_override=None, topic_override=None, year_override=None):
+    """
+    Fetch all URLs concurrently, at most max_workers fetching at once
+    to avoid YouTube rate limiting, then write the files concurrently.
+    With prefetch, the batch is fetched by max_workers concurrent
+    yt-dlp processes (fetch_video_batch_async) instead. Videos it could
+    not fetch are reported as failures, not retried one by one.
+    Names are assigned between the two steps, so videos that build the
+    same name get numbered ones instead of writing the same files.
+    Returns one success flag per URL.
+    """
+    # Library fetches and file writes go through asyncio.to_thread; size the default
+    # executor so max_workers bounds them, not min(32, cpu_count + 4).
+    # Each executor thread reuses one YoutubeDL for the whole batch. The executor exits
+    # first and waits for its threads, so instances are only closed once nothing uses them.
+    with ydl_session() as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        asyncio.get_running_loop().set_default_executor(executor)
+        sem = asyncio.Semaphore(max_workers)
+
+        prefetched = {}
+        if prefetch:
+            prefetched = await fetch_video_batch_async(
+                urls, max_workers, include_links=include_links, use_cache=use_cache
+            )
+
+        videos = await asyncio.gather(*(
+            fetch_single_async(
+                url, sem,
+                include_links=include_links,
+                use_cache=use_cache,
+                video=prefetched.get(extract_video_id(url)),
+                session=session,
+                fetch=not prefetch
+            )
+            for url in urls
+        ))
+
+        fetched = [video for video in videos if video]
+        for video in fetched:
+            apply_overrides(video, author_override, topic_override, year_override)
+
+        config = _load_config_cached("settings", PROJECT_ROOT / "config")
+        max_length = config.get("filename_max_length", 50)
+        filenames = unique_batch_filenames(
+            ((v.proposed_author, v.proposed_topic, v.proposed_year) for v in fetched),
+            max_length=max_length
+        )
+        for video, filename in zip(fetched, filenames):
+            if filename != build_filename(video.proposed_author, video.proposed_topic,
+                                          video.proposed_year, max_length=max_length):
+                print(f"NOTE: name already used in this batch, saving {video.url} as {filename}",
+                      file=sys.stderr)
+
+        saved = iter(await asyncio.gather(*(
+            save_single_async(video, output_base, filename)
+            for video, filename in zip(fetched, filenames)
+        )))
+        return [bool(video) and next(saved) for video in videos]
+
+
 def parse_args():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -149,6 +253,12 @@ def parse_args():
         action="store_true",
         help="Exclude links from video description"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local metadata/transcript cache "
+             "($XDG_CACHE_HOME/yt-transcriber, default ~/.cache/yt-transcriber)"
+    )
 
     return parser.parse_args()
 
@@ -174,6 +284,10 @@ def main():
         print("ERROR: No URLs provided. Pass URLs as arguments or use --from-file.", file=sys.stderr)
         sys.exit(1)
 
+    urls, duplicates = dedupe_urls(urls)
+    for url in duplicates:
+        print(f"Skipping duplicate video: {url}", file=sys.stderr)
+
     # Override flags only apply to single URL
     if len(urls) > 1 and any([args.author, args.topic, args.year]):
         print("WARNING: --author, --topic, --year overrides ignored for batch processing.",
@@ -181,24 +295,33 @@ def main():
 
     output_base = load_output_base(args.output_dir)
     include_links = not args.no_links
-
-    success_count = 0
-    fail_count = 0
-
-    for url in urls:
-        overrides = {}
-        if len(urls) == 1:
-            overrides = {
-                "author_override": args.author,
-                "topic_override": args.topic,
-                "year_override": args.year,
-            }
-
-        ok = process_single(url, output_base, include_links=include_links, **overrides)
-        if ok:
-            success_count += 1
-        else:
-            fail_count += 1
+    use_cache = not args.no_cache
+
+    overrides = {}
+    if len(urls) == 1:
+        overrides = {
+            "author_override": args.author,
+            "topic_override": args.topic,
+            "year_override": args.year,
+        }
+
+    config = _load_config_cached("settings", PROJECT_ROOT / "config")
+    max_workers = config.get("max_workers", 8)
+
+    # Batch mode with the yt-dlp CLI: split the URLs across max_workers concurrent
+    # processes, sharing process startup within each. The in-process library has no
+    # such startup cost, so there each video is fetched by its own task instead.
+    prefetch = len(urls) > 1 and not HAS_YT_DLP_LIB
+
+    # Each URL is dominated by blocking yt-dlp network calls, so overlap them
+    results = asyncio.run(run_batch(
+        urls, output_base, max_workers, prefetch,
+        include_links=include_links,
+        use_cache=use_cache,
+        **overrides
+    ))
+    success_count = sum(results)
+    fail_count = len(results) - success_count
 
     # Summary
     print(f"\nComplete: {success_count} succeeded, {fail_count} failed.")
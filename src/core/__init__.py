@@ -1,13 +1,19 @@
-"""Core modules: models, downloader, writers."""
+"""Core modules: models, downloader, async_downloader, writers."""
 from src.core.models import VideoMeta, TranscriptEntry, ProcessResult, BatchState
 from src.core.downloader import (
     extract_video_id,
     fetch_metadata,
     fetch_transcript,
+    fetch_video,
     format_duration,
     format_date,
+    ydl_session,
 )
-from src.core.writers import write_markdown, write_docx, write_json
+from src.core.async_downloader import (
+    fetch_video_async,
+    fetch_video_batch_async,
+)
+from src.core.writers import write_markdown, write_docx, write_json, normalize_transcript
 
 __all__ = [
     "VideoMeta",
@@ -17,9 +23,14 @@ __all__ = [
     "extract_video_id",
     "fetch_metadata",
     "fetch_transcript",
+    "fetch_video",
     "format_duration",
     "format_date",
+    "ydl_session",
+    "fetch_video_async",
+    "fetch_video_batch_async",
     "write_markdown",
     "write_docx",
     "write_json",
+    "normalize_transcript",
 ]
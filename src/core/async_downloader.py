@@ -0,0 +1,184 @@
+"""
+Module: async_downloader
+Purpose: asyncio variants of the downloader fetches for concurrent batches
+Created: 2026-10-14
+
+The yt-dlp CLI fallback runs through asyncio.create_subprocess_exec, so
+network waits overlap without one OS thread per video. The in-process
+yt_dlp library is blocking Python and is run via asyncio.to_thread.
+"""
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from src.core import downloader
+from src.core.downloader import (
+    PendingExtract,
+    YdlSession,
+    attach_transcript,
+    begin_extract,
+    build_video_meta,
+    extract,
+    extract_video_id,
+    finish_extract,
+    read_cli_outputs,
+    yt_dlp_batch_command,
+    yt_dlp_command,
+)
+from src.core.models import VideoMeta, TranscriptEntry
+
+
+async def _extract_with_cli_async(
+    vid: str,
+    metadata: bool,
+    subtitles: bool
+) -> tuple[Optional[dict], list[TranscriptEntry]]:
+    """Fetch info dict and/or transcript with a non-blocking yt-dlp subprocess."""
+    with tempfile.TemporaryDirectory(prefix="yt_") as tmp_dir:
+        tmp_base = str(Path(tmp_dir) / vid)
+        proc = await asyncio.create_subprocess_exec(
+            *yt_dlp_command(vid, tmp_base, metadata, subtitles),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        await proc.wait()
+        # Reading and parsing the sidecar files is blocking file I/O
+        return await asyncio.to_thread(read_cli_outputs, tmp_base, subtitles)
+
+
+def _read_batch_outputs(
+    vids: list[str],
+    tmp_dir: str,
+    subtitles: bool
+) -> dict[str, tuple[dict, list[TranscriptEntry]]]:
+    """Read the sidecar files of a batch run, for the videos yt-dlp wrote."""
+    fetched = {}
+    for vid in vids:
+        meta, transcript = read_cli_outputs(str(Path(tmp_dir) / vid), subtitles)
+        if meta:
+            fetched[vid] = (meta, transcript)
+    return fetched
+
+
+async def _extract_batch_with_cli_async(
+    vids: list[str],
+    subtitles: bool
+) -> dict[str, tuple[dict, list[TranscriptEntry]]]:
+    """Fetch info dicts (and transcripts) for several videos with one yt-dlp subprocess."""
+    with tempfile.TemporaryDirectory(prefix="yt_batch_") as tmp_dir:
+        proc = await asyncio.create_subprocess_exec(
+            *yt_dlp_batch_command(vids, tmp_dir, subtitles),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        await proc.wait()
+        return await asyncio.to_thread(_read_batch_outputs, vids, tmp_dir, subtitles)
+
+
+def _finish_batch(
+    pending: list[PendingExtract],
+    fetched: dict[str, tuple[dict, list[TranscriptEntry]]]
+) -> dict[str, tuple[dict, list[TranscriptEntry]]]:
+    """finish_extract for every video of a batch; drops those without metadata."""
+    results = {}
+    for p in pending:
+        if p.needs_fetch:
+            meta, transcript = finish_extract(p, *fetched.get(p.vid, (None, [])))
+        else:
+            meta, transcript = finish_extract(p)
+        if meta is not None:
+            results[p.vid] = (meta, transcript)
+    return results
+
+
+async def _extract_async(
+    vid: str,
+    metadata: bool = True,
+    subtitles: bool = False,
+    use_cache: bool = True,
+    session: Optional[YdlSession] = None
+) -> tuple[Optional[dict], list[TranscriptEntry]]:
+    """Async counterpart of downloader.extract, sharing its cache steps."""
+    if downloader.HAS_YT_DLP_LIB:
+        return await asyncio.to_thread(extract, vid, metadata, subtitles, use_cache, session)
+    
+    # Cache reads and writes are file I/O; keep them off the event loop
+    pending = await asyncio.to_thread(begin_extract, vid, metadata, subtitles, use_cache)
+    if not pending.needs_fetch:
+        return finish_extract(pending)
+    
+    fetched = await _extract_with_cli_async(vid, pending.need_meta, pending.need_subs)
+    return await asyncio.to_thread(finish_extract, pending, *fetched)
+
+
+async def fetch_video_async(
+    url: str,
+    include_links: bool = True,
+    use_cache: bool = True,
+    session: Optional[YdlSession] = None
+) -> Optional[VideoMeta]:
+    """
+    Async fetch_video: metadata and transcript in a single extraction.
+    session: reuse its YoutubeDL per worker thread (library only).
+    
+    Returns:
+        VideoMeta with metadata, transcript and links populated,
+        or None if fetch fails.
+    """
+    vid = extract_video_id(url)
+    if not vid:
+        return None
+    
+    meta, transcript = await _extract_async(
+        vid, metadata=True, subtitles=True, use_cache=use_cache, session=session
+    )
+    if meta is None:
+        return None
+    
+    video = build_video_meta(vid, url, meta)
+    return attach_transcript(video, transcript, include_links)
+
+
+async def fetch_video_batch_async(
+    urls: list[str],
+    max_workers: int,
+    include_links: bool = True,
+    use_cache: bool = True
+) -> dict[str, VideoMeta]:
+    """
+    Batch fetch_video for the yt-dlp CLI. Videos missing from the cache
+    are split into max_workers groups, each fetched by one yt-dlp process,
+    with the processes running concurrently. Each group shares process
+    startup across its videos; yt-dlp extracts them one after another.
+    
+    Returns:
+        Dict of video_id -> VideoMeta with transcript and links populated,
+        in input order. Videos that could not be fetched (or invalid URLs)
+        are missing.
+    """
+    url_by_vid = {}
+    for url in urls:
+        vid = extract_video_id(url)
+        if vid and vid not in url_by_vid:
+            url_by_vid[vid] = url
+    
+    pending = await asyncio.gather(*(
+        asyncio.to_thread(begin_extract, vid, True, True, use_cache) for vid in url_by_vid
+    ))
+    
+    fetched = {}
+    if missing := [p.vid for p in pending if p.needs_fetch]:
+        groups = min(max_workers, len(missing))
+        print(f"Fetching {len(missing)} videos in {groups} yt-dlp processes...")
+        for part in await asyncio.gather(*(
+            _extract_batch_with_cli_async(missing[i::groups], True) for i in range(groups)
+        )):
+            fetched.update(part)
+    
+    results = await asyncio.to_thread(_finish_batch, pending, fetched)
+    return {
+        vid: attach_transcript(build_video_meta(vid, url_by_vid[vid], meta), transcript, include_links)
+        for vid, (meta, transcript) in results.items()
+    }
+
@@ -5,14 +5,61 @@ Created: 2026-01-28
 Updated: 2026-01-29
 Session: yt_trans_20260129_002 | Context: 17
 """
+import copy
+import io
 import json
+import os
 import re
 import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from src.core.models import VideoMeta, TranscriptEntry
 
+# Prefer yt-dlp in-process - falls back to the yt-dlp CLI if only the tool is installed
+try:
+    from yt_dlp import YoutubeDL
+    from yt_dlp.utils import DownloadError, YoutubeDLError
+    HAS_YT_DLP_LIB = True
+except ImportError:
+    HAS_YT_DLP_LIB = False
+
+_YDL_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "skip_download": True,
+    "writeautomaticsub": True,
+    "subtitleslangs": ["en"],
+    "subtitlesformat": "vtt",
+}
+
+_VID_RE = re.compile(r"(?:v=|/v/|youtu\.be/|/embed/|/shorts/|/live/)([a-zA-Z0-9_-]{11})")
+_BARE_ID_RE = re.compile(r"^([a-zA-Z0-9_-]{11})$")
+_VTT_TS_RE = re.compile(r'(\d+):(\d+):(\d+)\.(\d+)')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_URL_RE = re.compile(r'(https?://[^\s<>"]+)')
+
+# Auto-captions repeat lines from a rolling display window; duplicates are near each other
+_DEDUP_WINDOW = 32
+
+_MAX_LINKS = 20
+
+# Persistent cache of fetched metadata/transcripts, keyed by video ID
+_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "yt-transcriber"
+_CACHE_TTL = 86400  # seconds
+
+# Info dict fields consumed by build_video_meta; the full dict is too large to cache
+_META_FIELDS = (
+    "title", "channel", "uploader", "channel_url", "upload_date", "duration",
+    "view_count", "like_count", "channel_follower_count", "description", "chapters",
+)
+
 
 def extract_video_id(url: str) -> Optional[str]:
     """
@@ -31,12 +78,9 @@ def extract_video_id(url: str) -> Optional[str]:
     Returns:
         11-character video ID or None if not found
     """
-    patterns = [
-        r"(?:v=|/v/|youtu\.be/|/embed/|/shorts/|/live/)([a-zA-Z0-9_-]{11})",
-        r"^([a-zA-Z0-9_-]{11})$"  # bare ID
-    ]
-    for pattern in patterns:
-        if match := re.search(pattern, url.strip()):
+    url = url.strip()
+    for pattern in (_VID_RE, _BARE_ID_RE):
+        if match := pattern.search(url):
             return match.group(1)
     return None
 
@@ -68,24 +112,34 @@ def extract_links_from_description(description: str) -> list[dict]:
     Extract URLs and their context from video description.
     
     Returns list of {"url": str, "context": str} dicts.
-    Limited to 20 links.
+    Limited to _MAX_LINKS links.
     """
     if not description:
         return []
     
     links = []
-    url_pattern = r'(https?://[^\s<>"]+)'
     
     for line in description.split('\n'):
-        if urls := re.findall(url_pattern, line):
-            context = re.sub(url_pattern, '', line).strip()
-            for url in urls:
-                links.append({
-                    "url": url,
-                    "context": context[:100] if context else ""
-                })
+        # One regex pass per line: collect URLs and the text between them
+        urls = []
+        parts = []
+        last = 0
+        for match in _URL_RE.finditer(line):
+            urls.append(match.group(1))
+            parts.append(line[last:match.start()])
+            last = match.end()
+        
+        if not urls:
+            continue
+        
+        parts.append(line[last:])
+        context = ''.join(parts).strip()[:100]
+        for url in urls:
+            links.append({"url": url, "context": context})
+            if len(links) >= _MAX_LINKS:
+                return links
     
-    return links[:20]
+    return links
 
 
 def parse_vtt_transcript(vtt_path: Path) -> list[TranscriptEntry]:
@@ -96,29 +150,49 @@ def parse_vtt_transcript(vtt_path: Path) -> list[TranscriptEntry]:
     if not vtt_path.exists():
         return []
     
+    # Stream line by line; long videos produce multi-MB caption files
+    with open(vtt_path, 'r', encoding='utf-8', errors='replace', buffering=65536) as f:
+        return parse_vtt_lines(f)
+
+
+def parse_vtt_lines(lines: Iterable[str]) -> list[TranscriptEntry]:
+    """
+    Parse VTT content line by line and return transcript with timestamps.
+    Deduplicates repeated lines common in auto-generated subtitles,
+    checking against the last _DEDUP_WINDOW unique lines.
+    """
     entries = []
     current_time = None
-    seen_text = set()
+    recent = deque()
+    recent_set = set()
     
-    for line in vtt_path.read_text(errors='replace').split('\n'):
+    for line in lines:
         line = line.strip()
-        
-        # Skip metadata
-        if not line or line.startswith(('WEBVTT', 'Kind:', 'Language:')) or line.isdigit():
+        if not line:
             continue
         
         # Parse timestamp line: "00:00:05.520 --> 00:00:08.160"
         if '-->' in line:
-            time_match = re.match(r'(\d+):(\d+):(\d+)\.(\d+)', line)
+            time_match = _VTT_TS_RE.match(line)
             if time_match:
                 h, m, s = int(time_match.group(1)), int(time_match.group(2)), int(time_match.group(3))
                 current_time = h * 3600 + m * 60 + s
             continue
         
+        # Skip metadata; first-char checks reject nearly all caption text cheaply
+        first = line[0]
+        if first in 'WKL' and line.startswith(('WEBVTT', 'Kind:', 'Language:')):
+            continue
+        if first.isdigit() and line.isdigit():
+            continue
+        
         # Clean HTML tags and normalize text
-        clean = re.sub(r'<[^>]+>', '', line)
-        if clean and clean not in seen_text:
-            seen_text.add(clean)
+        clean = _HTML_TAG_RE.sub('', line)
+        if clean and clean not in recent_set:
+            if len(recent) == _DEDUP_WINDOW:
+                recent_set.discard(recent.popleft())
+            recent.append(clean)
+            recent_set.add(clean)
             entries.append(TranscriptEntry(
                 timestamp=format_timestamp(current_time) if current_time is not None else "[00:00]",
                 text=clean
@@ -127,44 +201,312 @@ def parse_vtt_transcript(vtt_path: Path) -> list[TranscriptEntry]:
     return entries
 
 
-def fetch_metadata(url: str) -> Optional[VideoMeta]:
-    """
-    Fetch video metadata from YouTube using yt-dlp.
-    Does NOT download transcript yet - just metadata for preview.
-    
-    Returns:
-        VideoMeta with raw metadata and proposed naming values,
-        or None if fetch fails.
-    """
-    vid = extract_video_id(url)
-    if not vid:
-        return None
-    
-    tmp_base = f"/tmp/yt_meta_{vid}"
-    
-    cmd = [
-        "yt-dlp",
-        "--write-info-json",
+def yt_dlp_command(vid: str, tmp_base: str, metadata: bool, subtitles: bool) -> list[str]:
+    """Build the yt-dlp CLI command writing sidecar files under tmp_base."""
+    cmd = ["yt-dlp"]
+    if metadata:
+        cmd += ["--write-info-json", "--no-write-playlist-metafiles"]
+    if subtitles:
+        cmd += ["--write-auto-sub", "--sub-lang", "en"]
+    cmd += [
         "--skip-download",
-        "--no-write-playlist-metafiles",
         "-o", tmp_base,
         f"https://youtube.com/watch?v={vid}"
     ]
+    return cmd
+
+
+def yt_dlp_batch_command(vids: list[str], tmp_dir: str, subtitles: bool) -> list[str]:
+    """
+    Build one yt-dlp CLI command fetching info dicts (and captions) for
+    several videos. Sidecars land at {tmp_dir}/{id}.info.json and
+    {id}.en.vtt, as read_cli_outputs expects.
+    """
+    cmd = ["yt-dlp", "--write-info-json", "--no-write-playlist-metafiles"]
+    if subtitles:
+        cmd += ["--write-auto-sub", "--sub-lang", "en"]
+    cmd += [
+        "--skip-download",
+        "-o", str(Path(tmp_dir) / "%(id)s"),
+        *(f"https://youtube.com/watch?v={vid}" for vid in vids)
+    ]
+    return cmd
+
+
+def read_cli_outputs(tmp_base: str, subtitles: bool) -> tuple[Optional[dict], list[TranscriptEntry]]:
+    """Read the info dict and parsed transcript written by the yt-dlp CLI."""
+    meta = None
+    json_file = Path(f"{tmp_base}.info.json")
+    if json_file.exists():
+        meta = json.loads(json_file.read_text())
     
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    transcript = parse_vtt_transcript(Path(f"{tmp_base}.en.vtt")) if subtitles else []
+    return meta, transcript
+
+
+def _extract_with_cli(
+    vid: str,
+    metadata: bool,
+    subtitles: bool
+) -> tuple[Optional[dict], list[TranscriptEntry]]:
+    """Fetch info dict and/or transcript by shelling out to yt-dlp."""
+    with tempfile.TemporaryDirectory(prefix="yt_") as tmp_dir:
+        tmp_base = str(Path(tmp_dir) / vid)
+        subprocess.run(yt_dlp_command(vid, tmp_base, metadata, subtitles), capture_output=True, text=True)
+        return read_cli_outputs(tmp_base, subtitles)
+
+
+def _download_subtitles(ydl: "YoutubeDL", meta: dict) -> list[TranscriptEntry]:
+    """Download and parse the English auto-captions selected by yt-dlp."""
+    sub = (meta.get("requested_subtitles") or {}).get("en")
+    if not sub:
+        return []
     
-    json_file = Path(f"{tmp_base}.info.json")
+    if sub.get("data"):
+        return parse_vtt_lines(sub["data"].split('\n'))
     
-    if not json_file.exists():
-        return None
+    if not sub.get("url"):
+        return []
+    
+    with ydl.urlopen(sub["url"]) as resp:
+        return parse_vtt_lines(io.TextIOWrapper(resp, encoding="utf-8", errors="replace"))
+
+
+def _new_ydl() -> "YoutubeDL":
+    """
+    A YoutubeDL built from its own copy of _YDL_OPTS. yt-dlp keeps and
+    mutates the params dict it is given, so instances must not share one.
+    """
+    return YoutubeDL(copy.deepcopy(_YDL_OPTS))
+
+
+class YdlSession:
+    """
+    One YoutubeDL per worker thread (instances are not thread-safe),
+    reused across fetches to skip extractor setup and keep HTTP
+    connections alive. Pass it to extract / fetch_video; close() only
+    once no thread is fetching through it any more.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances = []
     
+    def get(self) -> "YoutubeDL":
+        """This thread's YoutubeDL, created on first use."""
+        ydl = getattr(self._local, "ydl", None)
+        if ydl is None:
+            ydl = self._local.ydl = _new_ydl()
+            with self._lock:
+                self._instances.append(ydl)
+        return ydl
+    
+    def close(self) -> None:
+        """Close every instance created through this session."""
+        with self._lock:
+            instances, self._instances = self._instances, []
+        for ydl in instances:
+            ydl.close()
+
+
+@contextmanager
+def ydl_session():
+    """
+    Yield a YdlSession that is closed on exit. Exit only after every
+    thread using it has finished, e.g. after shutting down the executor
+    the fetches run in.
+    
+    Without a session each fetch opens and closes its own instance.
+    """
+    session = YdlSession()
     try:
-        meta = json.loads(json_file.read_text())
+        yield session
     finally:
-        # Cleanup
-        if json_file.exists():
-            json_file.unlink()
+        session.close()
+
+
+@contextmanager
+def _ydl(session: Optional[YdlSession]):
+    """This thread's session YoutubeDL, or a fresh instance closed on exit."""
+    if session is None:
+        with _new_ydl() as ydl:
+            yield ydl
+    else:
+        yield session.get()
+
+
+def _extract_with_library(
+    vid: str,
+    metadata: bool,
+    subtitles: bool,
+    session: Optional[YdlSession] = None
+) -> tuple[Optional[dict], list[TranscriptEntry]]:
+    """Fetch info dict and/or transcript in-process via yt_dlp.YoutubeDL."""
+    with _ydl(session) as ydl:
+        try:
+            meta = ydl.extract_info(f"https://youtube.com/watch?v={vid}", download=False)
+        except DownloadError:
+            return None, []
+        
+        transcript = []
+        if subtitles and meta:
+            try:
+                transcript = _download_subtitles(ydl, meta)
+            except (YoutubeDLError, OSError):
+                transcript = []
+    
+    return (meta if metadata else None), transcript
+
+
+def _cache_read(vid: str, kind: str):
+    """Return cached JSON data for vid, or None if missing, stale or unreadable."""
+    path = _CACHE_DIR / f"{vid}.{kind}.json"
+    try:
+        if time.time() - path.stat().st_mtime >= _CACHE_TTL:
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_write(vid: str, kind: str, data) -> None:
+    """Atomically write JSON data to the cache. Failures are ignored."""
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_name, _CACHE_DIR / f"{vid}.{kind}.json")
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError:
+        pass
+
+
+def _trim_meta(meta: dict) -> dict:
+    """Keep only the info dict fields used to build VideoMeta."""
+    return {k: meta[k] for k in _META_FIELDS if k in meta}
+
+
+def _store_fetched(
+    vid: str,
+    meta: Optional[dict],
+    transcript: list[TranscriptEntry],
+    use_cache: bool
+) -> tuple[Optional[dict], list[TranscriptEntry]]:
+    """Trim freshly fetched metadata and write whatever was fetched to the cache."""
+    if meta:
+        meta = _trim_meta(meta)
+    
+    if use_cache:
+        if meta:
+            _cache_write(vid, "meta", meta)
+        if transcript:
+            _cache_write(vid, "transcript", [[e.timestamp, e.text] for e in transcript])
+    
+    return meta, transcript
+
+
+@dataclass(slots=True)
+class PendingExtract:
+    """Cached values for one video, and which parts still have to be fetched."""
+    vid: str
+    meta: Optional[dict]
+    transcript: Optional[list[TranscriptEntry]]
+    need_meta: bool
+    need_subs: bool
+    use_cache: bool
+    
+    @property
+    def needs_fetch(self) -> bool:
+        return self.need_meta or self.need_subs
+
+
+def begin_extract(
+    vid: str,
+    metadata: bool = True,
+    subtitles: bool = False,
+    use_cache: bool = True
+) -> PendingExtract:
+    """
+    First step of extract: look up the on-disk cache.
+    
+    Callers that run yt-dlp themselves (e.g. async_downloader) fetch
+    pending.need_meta / pending.need_subs when pending.needs_fetch, then
+    hand the result to finish_extract.
+    """
+    meta = transcript = None
+    if use_cache:
+        meta = _cache_read(vid, "meta") if metadata else None
+        if subtitles and (cached := _cache_read(vid, "transcript")) is not None:
+            transcript = [TranscriptEntry(ts, text) for ts, text in cached]
+    
+    return PendingExtract(
+        vid=vid,
+        meta=meta,
+        transcript=transcript,
+        need_meta=metadata and meta is None,
+        need_subs=subtitles and transcript is None,
+        use_cache=use_cache,
+    )
+
+
+def finish_extract(
+    pending: PendingExtract,
+    fetched_meta: Optional[dict] = None,
+    fetched_transcript: Optional[list[TranscriptEntry]] = None
+) -> tuple[Optional[dict], list[TranscriptEntry]]:
+    """
+    Last step of extract: cache what was fetched and merge it with the
+    cached values. Pass nothing when pending.needs_fetch was False.
     
+    Returns:
+        (metadata dict or None, transcript entries)
+    """
+    meta, transcript = pending.meta, pending.transcript
+    if pending.needs_fetch:
+        fetched_meta, fetched_transcript = _store_fetched(
+            pending.vid, fetched_meta, fetched_transcript or [], pending.use_cache
+        )
+        if pending.need_meta:
+            meta = fetched_meta
+        if pending.need_subs:
+            transcript = fetched_transcript
+    
+    return meta, transcript or []
+
+
+def extract(
+    vid: str,
+    metadata: bool = True,
+    subtitles: bool = False,
+    use_cache: bool = True,
+    session: Optional[YdlSession] = None
+) -> tuple[Optional[dict], list[TranscriptEntry]]:
+    """
+    Fetch yt-dlp metadata and/or parsed transcript for a video.
+    Serves from the on-disk cache when possible and fetches only
+    what is missing. session: reuse its YoutubeDL (library only).
+    
+    Returns:
+        (metadata dict or None, transcript entries)
+    """
+    pending = begin_extract(vid, metadata, subtitles, use_cache)
+    if not pending.needs_fetch:
+        return finish_extract(pending)
+    
+    if HAS_YT_DLP_LIB:
+        fetched = _extract_with_library(vid, pending.need_meta, pending.need_subs, session)
+    else:
+        fetched = _extract_with_cli(vid, pending.need_meta, pending.need_subs)
+    return finish_extract(pending, *fetched)
+
+
+def build_video_meta(vid: str, url: str, meta: dict) -> VideoMeta:
+    """Build VideoMeta from a yt-dlp info dict."""
     return VideoMeta(
         video_id=vid,
         url=url,
@@ -183,39 +525,81 @@ def fetch_metadata(url: str) -> Optional[VideoMeta]:
     )
 
 
-def fetch_transcript(video: VideoMeta, include_links: bool = True) -> VideoMeta:
+def attach_transcript(
+    video: VideoMeta,
+    transcript: list[TranscriptEntry],
+    include_links: bool
+) -> VideoMeta:
+    """Populate transcript and description links on video."""
+    video.transcript = transcript
+    
+    # Extract links from description
+    if include_links:
+        video.links = extract_links_from_description(video.description)
+    
+    return video
+
+
+def fetch_video(
+    url: str,
+    include_links: bool = True,
+    use_cache: bool = True,
+    session: Optional[YdlSession] = None
+) -> Optional[VideoMeta]:
     """
-    Fetch transcript for a video that already has metadata.
-    Updates the video object in place with transcript and links.
+    Fetch metadata and transcript in a single yt-dlp extraction.
+    Avoids the second extraction and YouTube handshake of the
+    two-stage fetch_metadata + fetch_transcript path.
     
     Returns:
-        Updated VideoMeta with transcript populated.
+        VideoMeta with metadata, transcript and links populated,
+        or None if fetch fails.
     """
-    vid = video.video_id
-    tmp_base = f"/tmp/yt_trans_{vid}"
-    
-    cmd = [
-        "yt-dlp",
-        "--write-auto-sub",
-        "--sub-lang", "en",
-        "--skip-download",
-        "-o", tmp_base,
-        f"https://youtube.com/watch?v={vid}"
-    ]
+    vid = extract_video_id(url)
+    if not vid:
+        return None
     
-    subprocess.run(cmd, capture_output=True, text=True)
+    meta, transcript = extract(
+        vid, metadata=True, subtitles=True, use_cache=use_cache, session=session
+    )
+    if meta is None:
+        return None
     
-    vtt_file = Path(f"{tmp_base}.en.vtt")
+    video = build_video_meta(vid, url, meta)
+    return attach_transcript(video, transcript, include_links)
+
+
+def fetch_metadata(url: str, use_cache: bool = True) -> Optional[VideoMeta]:
+    """
+    Fetch video metadata from YouTube using yt-dlp.
+    Does NOT download transcript yet - just metadata for preview.
     
-    # Parse transcript
-    video.transcript = parse_vtt_transcript(vtt_file)
+    Returns:
+        VideoMeta with raw metadata and proposed naming values,
+        or None if fetch fails.
+    """
+    vid = extract_video_id(url)
+    if not vid:
+        return None
     
-    # Extract links from description
-    if include_links:
-        video.links = extract_links_from_description(video.description)
+    meta, _ = extract(vid, metadata=True, subtitles=False, use_cache=use_cache)
+    if meta is None:
+        return None
     
-    # Cleanup
-    if vtt_file.exists():
-        vtt_file.unlink()
+    return build_video_meta(vid, url, meta)
+
+
+def fetch_transcript(
+    video: VideoMeta,
+    include_links: bool = True,
+    use_cache: bool = True
+) -> VideoMeta:
+    """
+    Fetch transcript for a video that already has metadata.
+    Updates the video object in place with transcript and links.
     
-    return video
+    Returns:
+        Updated VideoMeta with transcript populated.
+    """
+    _, transcript = extract(video.video_id, metadata=False, subtitles=True, use_cache=use_cache)
+    return attach_transcript(video, transcript, include_links)
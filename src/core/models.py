@@ -4,12 +4,34 @@ Purpose: Data models for YT Transcriber
 Created: 2026-01-28
 Session: yt_trans_20260128_001 | Context: 1
 """
+import re
 from dataclasses import dataclass, field
 from typing import Optional
 from datetime import datetime
 
+# Common title prefixes like "EP 123:" or "#45"
+_EP_PREFIX_RE = re.compile(r'^(EP\.?\s*\d+[:\s-]*|#\d+[:\s-]*)', re.IGNORECASE)
 
-@dataclass
+
+def _remove_ignore_case(text: str, sub: str) -> str:
+    """Remove all case-insensitive occurrences of sub from text."""
+    low, sub_low = text.lower(), sub.lower()
+    if sub_low not in low:
+        return text
+    if len(low) != len(text) or len(sub_low) != len(sub):
+        # Lowercasing changed lengths (rare Unicode), so indices don't line up
+        return re.sub(re.escape(sub), '', text, flags=re.IGNORECASE)
+    
+    parts = []
+    start = 0
+    while (i := low.find(sub_low, start)) >= 0:
+        parts.append(text[start:i])
+        start = i + len(sub)
+    parts.append(text[start:])
+    return ''.join(parts)
+
+
+@dataclass(slots=True)
 class VideoMeta:
     """
     Metadata for a YouTube video.
@@ -56,24 +78,23 @@ class VideoMeta:
     
     def _clean_title_for_topic(self) -> str:
         """Extract a clean topic from title."""
-        import re
         topic = self.title
         # Remove common prefixes like "EP 123:" or "#45"
-        topic = re.sub(r'^(EP\.?\s*\d+[:\s-]*|#\d+[:\s-]*)', '', topic, flags=re.IGNORECASE)
+        topic = _EP_PREFIX_RE.sub('', topic)
         # Remove channel name if it appears in title
-        if self.channel and self.channel.lower() in topic.lower():
-            topic = re.sub(re.escape(self.channel), '', topic, flags=re.IGNORECASE)
+        if self.channel:
+            topic = _remove_ignore_case(topic, self.channel)
         return topic.strip()[:100] or "Untitled"
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptEntry:
     """Single transcript entry with timestamp."""
     timestamp: str  # "[MM:SS]" format
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessResult:
     """Result of processing a video."""
     video_id: str
@@ -88,7 +109,7 @@ class ProcessResult:
         return self.status == "success"
 
 
-@dataclass
+@dataclass(slots=True)
 class BatchState:
     """
     State container for batch processing workflow.
@@ -9,14 +9,29 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from docx import Document as DocxDocument
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-
 from src.core.models import VideoMeta, TranscriptEntry
+from src.utils.filename import ensure_dir
+
+
+def normalize_transcript(entries: list) -> list[tuple[str, str]]:
+    """
+    Convert TranscriptEntry objects or plain dicts to (timestamp, text) pairs.
+    
+    Compute once and pass as ``entries`` to write_markdown/write_docx when
+    writing several formats for the same video.
+    """
+    return [
+        (e.timestamp, e.text) if isinstance(e, TranscriptEntry)
+        else (e.get("timestamp", ""), e.get("text", ""))
+        for e in entries
+    ]
 
 
-def write_markdown(video: VideoMeta, output_path: Path) -> Path:
+def write_markdown(
+    video: VideoMeta,
+    output_path: Path,
+    entries: Optional[list[tuple[str, str]]] = None
+) -> Path:
     """
     Write video transcript as Markdown file.
     
@@ -27,68 +42,74 @@ def write_markdown(video: VideoMeta, output_path: Path) -> Path:
         - Chapters (if present)
         - Transcript with timestamps
     
+    Args:
+        entries: Optional precomputed normalize_transcript(video.transcript)
+    
     Returns:
         Path to written file
     """
-    lines = [
-        f"# {video.title}\n",
-        f"**URL:** https://youtube.com/watch?v={video.video_id}  ",
-        f"**Channel:** [{video.channel}]({video.channel_url})  ",
-        f"**Subscribers:** {video.channel_follower_count:,}  ",
-        f"**Date:** {video.upload_date_formatted}  ",
-        f"**Duration:** {video.duration_formatted}  ",
-        f"**Views:** {video.view_count:,} · **Likes:** {video.like_count:,}",
-        ""
-    ]
-    
-    # Links section
-    if video.links:
-        lines.append("\n## Links Mentioned\n")
-        for link in video.links:
-            ctx = f" — {link['context']}" if link.get('context') else ""
-            lines.append(f"- <{link['url']}>{ctx}")
-        lines.append("")
-    
-    # Chapters section
-    if video.chapters:
-        lines.append("\n## Chapters\n")
-        for ch in video.chapters:
-            t = int(ch.get('start_time', 0))
-            timestamp = f"{t//60}:{t%60:02d}"
-            lines.append(f"- **{timestamp}** — {ch.get('title', '')}")
-        lines.append("")
-    
-    # Transcript section
-    lines.append("\n---\n\n## Transcript\n")
-    
-    if video.transcript:
-        current_ts = None
-        para_lines = []
+    ensure_dir(output_path.parent)
+    
+    with open(output_path, 'w', encoding='utf-8', buffering=65536) as f:
+        f.write(
+            f"# {video.title}\n\n"
+            f"**URL:** https://youtube.com/watch?v={video.video_id}  \n"
+            f"**Channel:** [{video.channel}]({video.channel_url})  \n"
+            f"**Subscribers:** {video.channel_follower_count:,}  \n"
+            f"**Date:** {video.upload_date_formatted}  \n"
+            f"**Duration:** {video.duration_formatted}  \n"
+            f"**Views:** {video.view_count:,} · **Likes:** {video.like_count:,}\n"
+            "\n"
+        )
         
-        for entry in video.transcript:
-            ts = entry.timestamp if isinstance(entry, TranscriptEntry) else entry.get("timestamp", "")
-            text = entry.text if isinstance(entry, TranscriptEntry) else entry.get("text", "")
-            
-            if ts != current_ts:
-                if para_lines:
-                    lines.append(f"**{current_ts}** {' '.join(para_lines)}\n")
-                    para_lines = []
-                current_ts = ts
-            para_lines.append(text)
+        # Links section
+        if video.links:
+            f.write("\n## Links Mentioned\n\n")
+            for link in video.links:
+                ctx = f" — {link['context']}" if link.get('context') else ""
+                f.write(f"- <{link['url']}>{ctx}\n")
+            f.write("\n")
         
-        # Flush remaining
-        if para_lines:
-            lines.append(f"**{current_ts}** {' '.join(para_lines)}\n")
-    else:
-        lines.append("*No transcript available*")
-    
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text('\n'.join(lines))
+        # Chapters section
+        if video.chapters:
+            f.write("\n## Chapters\n\n")
+            for ch in video.chapters:
+                t = int(ch.get('start_time', 0))
+                timestamp = f"{t//60}:{t%60:02d}"
+                f.write(f"- **{timestamp}** — {ch.get('title', '')}\n")
+            f.write("\n")
+        
+        # Transcript section
+        f.write("\n---\n\n## Transcript\n\n")
+        
+        if video.transcript:
+            current_ts = None
+            
+            # One paragraph per timestamp; entries are appended as they arrive
+            if entries is None:
+                entries = normalize_transcript(video.transcript)
+            for ts, text in entries:
+                if ts != current_ts:
+                    if current_ts is not None:
+                        f.write("\n\n")
+                    f.write(f"**{ts}** ")
+                    current_ts = ts
+                else:
+                    f.write(" ")
+                f.write(text)
+            
+            f.write("\n")
+        else:
+            f.write("*No transcript available*")
     
     return output_path
 
 
-def write_docx(video: VideoMeta, output_path: Path) -> Path:
+def write_docx(
+    video: VideoMeta,
+    output_path: Path,
+    entries: Optional[list[tuple[str, str]]] = None
+) -> Path:
     """
     Write video transcript as Word document.
     
@@ -99,9 +120,17 @@ def write_docx(video: VideoMeta, output_path: Path) -> Path:
         - Chapters section (if present)
         - Transcript (page break, timestamped paragraphs)
     
+    Args:
+        entries: Optional precomputed normalize_transcript(video.transcript)
+    
     Returns:
         Path to written file
     """
+    # Deferred: python-docx pulls in lxml, which Markdown/JSON-only callers don't need
+    from docx import Document as DocxDocument
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    
     doc = DocxDocument()
     
     # Title
@@ -147,31 +176,23 @@ def write_docx(video: VideoMeta, output_path: Path) -> Path:
     doc.add_heading("Transcript", level=1)
     
     if video.transcript:
-        current_para_lines = []
+        p = None
         last_timestamp = None
         
-        for entry in video.transcript:
-            ts = entry.timestamp if isinstance(entry, TranscriptEntry) else entry.get("timestamp", "")
-            text = entry.text if isinstance(entry, TranscriptEntry) else entry.get("text", "")
-            
-            if last_timestamp is None or ts != last_timestamp:
-                # Flush current paragraph
-                if current_para_lines:
-                    p = doc.add_paragraph()
-                    p.add_run(' '.join(current_para_lines))
-                    current_para_lines = []
+        # One paragraph per timestamp, one run per entry
+        if entries is None:
+            entries = normalize_transcript(video.transcript)
+        for ts, text in entries:
+            if p is None or ts != last_timestamp:
+                p = doc.add_paragraph()
+                p.add_run(text)
                 last_timestamp = ts
-            
-            current_para_lines.append(text)
-        
-        # Flush remaining
-        if current_para_lines:
-            p = doc.add_paragraph()
-            p.add_run(' '.join(current_para_lines))
+            else:
+                p.add_run(' ' + text)
     else:
         doc.add_paragraph("No transcript available", style='Intense Quote')
     
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(output_path.parent)
     doc.save(output_path)
     
     return output_path
@@ -190,14 +211,6 @@ def write_json(video: VideoMeta, output_path: Path) -> Path:
     Returns:
         Path to written file
     """
-    # Convert transcript entries to dicts if needed
-    transcript_data = []
-    for entry in video.transcript:
-        if isinstance(entry, TranscriptEntry):
-            transcript_data.append({"timestamp": entry.timestamp, "text": entry.text})
-        else:
-            transcript_data.append(entry)
-    
     data = {
         "id": video.video_id,
         "title": video.title,
@@ -211,7 +224,7 @@ def write_json(video: VideoMeta, output_path: Path) -> Path:
         "description": video.description,
         "chapters": video.chapters,
         "links": video.links,
-        "transcript_entries": len(transcript_data),
+        "transcript_entries": len(video.transcript),
         "processed_at": datetime.now().isoformat(),
         # Naming metadata
         "saved_as": {
@@ -221,7 +234,8 @@ def write_json(video: VideoMeta, output_path: Path) -> Path:
         }
     }
     
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+    ensure_dir(output_path.parent)
+    with open(output_path, 'w', encoding='utf-8', buffering=65536) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
     
     return output_path
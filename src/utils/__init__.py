@@ -1,8 +1,22 @@
 """Utility modules."""
-from src.utils.filename import build_filename, build_output_path, generate_unique_filename
+from src.utils.filename import (
+    build_filename,
+    cached_build_filename,
+    unique_batch_filenames,
+    build_output_path,
+    author_dir,
+    generate_unique_filename,
+    ensure_dir,
+    reset_dir_cache,
+)
 
 __all__ = [
     "build_filename",
+    "cached_build_filename",
+    "unique_batch_filenames",
     "build_output_path",
+    "author_dir",
     "generate_unique_filename",
+    "ensure_dir",
+    "reset_dir_cache",
 ]
@@ -4,21 +4,31 @@ Purpose: Filename and path building utilities for YT Transcriber
 Created: 2026-01-28
 Session: yt_trans_20260128_001 | Context: 1
 """
+import functools
+import os
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 # Import from shared utils - falls back to local implementation if not installed
 try:
     from gzpqb_utils import sanitize_for_filename, expand_path
 except ImportError:
     # Fallback implementations
+    # Single-pass filter for ASCII: drop everything except letters, digits, "_", "-" and space
+    _SANITIZE_ASCII = dict.fromkeys(
+        c for c in range(128) if not (chr(c).isalnum() or chr(c) in "_- ")
+    )
+    _SANITIZE_NONWORD = re.compile(r'[^\w\s-]')
+    _SANITIZE_SPACE = re.compile(r'\s+')
+    
     def sanitize_for_filename(text: str, max_length: int = 50, replacement: str = "_") -> str:
         if not text:
             return "untitled"
-        clean = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', text)
-        clean = re.sub(r'[^\w\s-]', '', clean)
-        clean = re.sub(r'\s+', replacement, clean.strip())
+        clean = text.translate(_SANITIZE_ASCII)
+        if not clean.isascii():
+            clean = _SANITIZE_NONWORD.sub('', clean)
+        clean = _SANITIZE_SPACE.sub(replacement, clean.strip())
         clean = re.sub(f'{re.escape(replacement)}+', replacement, clean)
         clean = clean.strip(replacement)
         if len(clean) > max_length:
@@ -26,13 +36,29 @@ except ImportError:
         return clean or "untitled"
     
     def expand_path(path):
-        import os
         path = str(path)
         path = os.path.expanduser(path)
         path = os.path.expandvars(path)
         return Path(path).resolve()
 
 
+# Directories already created during this run; avoids a mkdir syscall per output file
+_MKDIR_CACHE: set[Path] = set()
+
+
+def ensure_dir(path: Path) -> Path:
+    """Create directory (and parents) once per run. Returns path."""
+    if path not in _MKDIR_CACHE:
+        path.mkdir(parents=True, exist_ok=True)
+        _MKDIR_CACHE.add(path)
+    return path
+
+
+def reset_dir_cache() -> None:
+    """Forget created directories, e.g. at the start of a new batch."""
+    _MKDIR_CACHE.clear()
+
+
 def build_filename(author: str, topic: str, year: str, max_length: int = 50) -> str:
     """
     Build filename from author, topic, and year.
@@ -60,6 +86,59 @@ def build_filename(author: str, topic: str, year: str, max_length: int = 50) ->
     return f"{clean_author}_{clean_topic}_{clean_year}"
 
 
+@functools.lru_cache(maxsize=512)
+def cached_build_filename(author: str, topic: str, year: str, max_length: int = 50) -> str:
+    """
+    Memoized build_filename.
+    
+    For callers that rebuild the same names repeatedly, e.g. the UI preview
+    on every Streamlit rerun. Lives here rather than in the UI script because
+    Streamlit re-executes the script (and any cache defined in it) per rerun.
+    """
+    return build_filename(author, topic, year, max_length=max_length)
+
+
+def unique_batch_filenames(
+    entries: Iterable[tuple[str, str, str]],
+    max_length: int = 50
+) -> list[str]:
+    """
+    Build filenames for a batch of (author, topic, year), numbering repeats.
+    
+    Different videos easily build the same name (episode prefixes are
+    stripped from topics, topics are truncated); written concurrently they
+    would clobber each other's files. Later repeats within the same author
+    folder get a suffix, as in generate_unique_filename:
+        {Author}_{Topic}_{Year}, {Author}_{Topic}_{Year}_2, ...
+    Compared case-insensitively, for case-insensitive filesystems.
+    
+    Returns:
+        One filename (without extension) per entry, in input order
+    """
+    used = set()
+    names = []
+    for author, topic, year in entries:
+        folder = sanitize_for_filename(author, max_length=50).casefold()
+        base = cached_build_filename(author, topic, year, max_length)
+        name = base
+        counter = 2
+        while (folder, name.casefold()) in used:
+            name = f"{base}_{counter}"
+            counter += 1
+        used.add((folder, name.casefold()))
+        names.append(name)
+    return names
+
+
+def author_dir(base_dir: str | Path, author: str) -> Path:
+    """
+    Author subfolder path: {base_dir}/{Author}, with ~ and env vars expanded.
+    
+    Does not create the directory; see ensure_dir.
+    """
+    return expand_path(base_dir) / sanitize_for_filename(author, max_length=50)
+
+
 def build_output_path(
     base_dir: str | Path,
     author: str,
@@ -82,15 +161,7 @@ def build_output_path(
     Returns:
         Full Path object, with parent directories created
     """
-    # Expand base directory
-    base = expand_path(base_dir)
-    
-    # Create author subfolder name
-    author_folder = sanitize_for_filename(author, max_length=50)
-    
-    # Build path
-    output_dir = base / author_folder
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = ensure_dir(author_dir(base_dir, author))
     
     # Ensure extension doesn't have leading dot
     extension = extension.lstrip('.')
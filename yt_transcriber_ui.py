@@ -11,7 +11,10 @@ Workflow:
     3. Review: User edits Author/Topic/Year in table
     4. Save: Download transcripts and write files with approved naming
 """
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add project root to path for imports
@@ -20,13 +23,18 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 import json
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 
 from src.core.models import VideoMeta, ProcessResult, BatchState
 from src.core.downloader import extract_video_id, fetch_metadata, fetch_transcript
-from src.core.writers import write_markdown, write_docx, write_json
-from src.utils.filename import build_filename, build_output_path
+from src.core.writers import write_markdown, write_docx, write_json, normalize_transcript
+from src.utils.filename import (
+    unique_batch_filenames,
+    build_output_path,
+    author_dir,
+    ensure_dir,
+    reset_dir_cache,
+)
 
 # Try to import shared utilities
 try:
@@ -41,15 +49,40 @@ except ImportError:
             return json.load(f)
     
     def expand_path(path):
-        import os
         return Path(os.path.expanduser(str(path))).resolve()
 
 
 # === LOAD CONFIG ===
-CONFIG = load_config("settings", PROJECT_ROOT / "config")
+SETTINGS_PATH = PROJECT_ROOT / "config" / "settings.json"
+
+
+@st.cache_resource(show_spinner=False)
+def _load_settings(mtime: float) -> dict:
+    """
+    Parse settings.json, shared across reruns and script reloads.
+    Keyed by the file's mtime, so editing the file takes effect on the next rerun.
+    """
+    return load_config("settings", PROJECT_ROOT / "config")
+
+
+CONFIG = _load_settings(SETTINGS_PATH.stat().st_mtime)
 OUTPUT_BASE = CONFIG.get("output_base", "~/My_Drive_Mirror/024_YT_TRANSCRIPTIONS")
 FILENAME_MAX_LENGTH = CONFIG.get("filename_max_length", 50)
 BATCH_MAX_SIZE = CONFIG.get("batch_max_size", 10)
+MAX_WORKERS = CONFIG.get("max_workers", 8)
+INCLUDE_LINKS_DEFAULT = CONFIG.get("include_links_default", True)
+
+# Minimum seconds between progress widget updates (the last item always updates)
+PROGRESS_INTERVAL = 0.1
+
+
+# st.fragment (1.37+, experimental_fragment before) scopes reruns to one block;
+# on older Streamlit the review table just reruns with the whole page
+_fragment = (
+    getattr(st, "fragment", None)
+    or getattr(st, "experimental_fragment", None)
+    or (lambda func: func)
+)
 
 
 # === SESSION STATE INITIALIZATION ===
@@ -75,10 +108,55 @@ def reset_state():
 
 
 # === PROCESSING FUNCTIONS ===
-def process_and_save_video(video: VideoMeta, output_base: str, include_links: bool) -> ProcessResult:
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_fetch_metadata(video_id: str, _url: str) -> VideoMeta:
+    """
+    fetch_metadata cached across reruns, keyed by video ID only.
+    Raises LookupError on failure so failed fetches are not cached.
+    """
+    meta = fetch_metadata(_url)
+    if meta is None:
+        raise LookupError(video_id)
+    return meta
+
+
+def fetch_metadata_cached(
+    url: str,
+    video_id: str | None = None,
+    use_cache: bool = True
+) -> VideoMeta | None:
+    """
+    Fetch metadata, reusing results from earlier reruns for the same video.
+    Pass video_id when the caller has already parsed it from url.
+    use_cache=False skips both the rerun cache and the on-disk cache.
+    """
+    if not use_cache:
+        return fetch_metadata(url, use_cache=False)
+    try:
+        return _cached_fetch_metadata(video_id or extract_video_id(url), url)
+    except LookupError:
+        return None
+
+
+def batch_filenames(videos: list[VideoMeta]) -> list[str]:
+    """Filenames for the selected videos, numbered where they would collide."""
+    return unique_batch_filenames(
+        ((v.proposed_author, v.proposed_topic, v.proposed_year) for v in videos),
+        max_length=FILENAME_MAX_LENGTH
+    )
+
+
+def process_and_save_video(
+    video: VideoMeta,
+    output_base: str,
+    filename: str,
+    include_links: bool,
+    use_cache: bool = True
+) -> ProcessResult:
     """
     Fetch transcript and save files for a single video.
-    Uses the approved author/topic/year for naming.
+    filename comes from batch_filenames (approved author/topic/year,
+    unique within the batch).
     """
     result = ProcessResult(
         video_id=video.video_id,
@@ -88,30 +166,20 @@ def process_and_save_video(video: VideoMeta, output_base: str, include_links: bo
     
     try:
         # Fetch transcript
-        video = fetch_transcript(video, include_links=include_links)
+        video = fetch_transcript(video, include_links=include_links, use_cache=use_cache)
         
-        # Build filename from approved values
-        filename = build_filename(
-            video.proposed_author,
-            video.proposed_topic,
-            video.proposed_year,
-            max_length=FILENAME_MAX_LENGTH
+        # Write files (transcript normalized once, shared by md and docx)
+        entries = normalize_transcript(video.transcript)
+        md_path, docx_path, json_path = (
+            build_output_path(output_base, video.proposed_author, filename, ext)
+            for ext in ("md", "docx", "json")
         )
         
-        # Write files
-        files = []
-        
-        md_path = build_output_path(output_base, video.proposed_author, filename, "md")
-        write_markdown(video, md_path)
-        files.append(str(md_path))
-        
-        docx_path = build_output_path(output_base, video.proposed_author, filename, "docx")
-        write_docx(video, docx_path)
-        files.append(str(docx_path))
-        
-        json_path = build_output_path(output_base, video.proposed_author, filename, "json")
+        # Sequential on purpose: the save phase already runs videos in parallel
+        write_markdown(video, md_path, entries)
+        write_docx(video, docx_path, entries)
         write_json(video, json_path)
-        files.append(str(json_path))
+        files = [str(md_path), str(docx_path), str(json_path)]
         
         result.status = "success"
         result.message = f"Saved: {filename}"
@@ -141,11 +209,23 @@ def render_input_phase():
     # Parse URLs
     urls = []
     if urls_text:
-        urls = [u.strip() for u in urls_text.strip().split('\n') if u.strip()]
-        valid_urls = [u for u in urls if extract_video_id(u)]
+        urls = [u for u in (line.strip() for line in urls_text.splitlines()) if u]
+        # Parse each line once; the (url, video_id) pairs are reused for fetching
+        valid_urls = [(u, vid) for u in urls if (vid := extract_video_id(u))]
+        
+        # Drop repeated videos (same ID, any URL form), keeping first occurrence
+        seen = set()
+        deduped = []
+        for url, vid in valid_urls:
+            if vid not in seen:
+                seen.add(vid)
+                deduped.append((url, vid))
         
         if valid_urls:
             st.caption(f"✓ {len(valid_urls)} valid URL(s) detected")
+            if len(deduped) < len(valid_urls):
+                st.caption(f"✓ {len(deduped)} unique")
+            valid_urls = deduped
             if len(valid_urls) > BATCH_MAX_SIZE:
                 st.warning(f"Maximum {BATCH_MAX_SIZE} URLs. Only first {BATCH_MAX_SIZE} will be processed.")
                 valid_urls = valid_urls[:BATCH_MAX_SIZE]
@@ -165,16 +245,27 @@ def render_input_phase():
         )
     
     if fetch_btn and valid_urls:
+        # Read widget state here; the worker threads have no script context
+        use_cache = st.session_state.get("use_cache", True)
         with st.spinner(f"Fetching metadata for {len(valid_urls)} video(s)..."):
-            videos = []
+            fetched = [None] * len(valid_urls)
             progress = st.progress(0)
+            last_update = 0.0
             
-            for i, url in enumerate(valid_urls):
-                meta = fetch_metadata(url)
-                if meta:
-                    videos.append(meta)
-                progress.progress((i + 1) / len(valid_urls))
+            # Network-bound and independent per URL: fetch concurrently, keep input order
+            with ThreadPoolExecutor(max_workers=min(len(valid_urls), MAX_WORKERS)) as ex:
+                futures = {
+                    ex.submit(fetch_metadata_cached, url, vid, use_cache): i
+                    for i, (url, vid) in enumerate(valid_urls)
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    fetched[futures[future]] = future.result()
+                    now = time.monotonic()
+                    if now - last_update > PROGRESS_INTERVAL or done == len(valid_urls):
+                        progress.progress(done / len(valid_urls))
+                        last_update = now
             
+            videos = [meta for meta in fetched if meta]
             progress.empty()
         
         if videos:
@@ -190,22 +281,32 @@ def render_review_phase():
     st.header("📝 Review & Edit Metadata")
     st.caption("Edit Author, Topic, and Year before saving. Uncheck rows to skip.")
     
-    videos = st.session_state.pending_videos
-    
-    # Build dataframe for editing
-    data = []
-    for v in videos:
-        data.append({
-            "Select": v.selected,
-            "Author": v.proposed_author,
-            "Topic": v.proposed_topic,
-            "Year": v.proposed_year,
-            "Original Title": v.title[:60] + "..." if len(v.title) > 60 else v.title,
-            "Channel": v.channel,
-            "_idx": videos.index(v)  # Hidden index for tracking
-        })
-    
-    df = pd.DataFrame(data)
+    _review_table(st.session_state.pending_videos)
+
+
+@_fragment
+def _review_table(videos: list[VideoMeta]):
+    """
+    Editable table, filename preview and action buttons.
+    Runs as a fragment, so cell edits rerun only this block; the buttons
+    live here too so the save count tracks the current selection.
+    """
+    # Deferred: only the review table needs pandas, keep it off the cold-start path
+    import pandas as pd
+    
+    # Truncate long titles for display with vectorized string ops
+    titles = pd.Series([v.title for v in videos], dtype=object)
+    display_titles = titles.mask(titles.str.len() > 60, titles.str.slice(0, 60) + "...")
+    
+    # Build dataframe for editing, one list per column
+    df = pd.DataFrame({
+        "Select": [v.selected for v in videos],
+        "Author": [v.proposed_author for v in videos],
+        "Topic": [v.proposed_topic for v in videos],
+        "Year": [v.proposed_year for v in videos],
+        "Original Title": display_titles,
+        "Channel": [v.channel for v in videos],
+    })
     
     # Editable table
     edited_df = st.data_editor(
@@ -217,32 +318,34 @@ def render_review_phase():
             "Year": st.column_config.TextColumn("Year", width="small"),
             "Original Title": st.column_config.TextColumn("Original Title", disabled=True, width="large"),
             "Channel": st.column_config.TextColumn("Channel", disabled=True, width="medium"),
-            "_idx": None  # Hide index column
         },
         hide_index=True,
         use_container_width=True,
         num_rows="fixed"
     )
     
-    # Update videos with edited values
-    for i, row in edited_df.iterrows():
-        idx = row["_idx"]
-        videos[idx].selected = row["Select"]
-        videos[idx].proposed_author = row["Author"]
-        videos[idx].proposed_topic = row["Topic"]
-        videos[idx].proposed_year = str(row["Year"])
+    # Update videos with edited values, skipping rows the user did not touch.
+    # num_rows="fixed" keeps edited rows in the same order as videos.
+    orig = [(v.selected, v.proposed_author, v.proposed_topic, v.proposed_year) for v in videos]
+    rows = edited_df.itertuples(index=False, name=None)
+    for v, before, (selected, author, topic, year, _, _) in zip(videos, orig, rows):
+        if (selected, author, topic, year) == before:
+            continue
+        v.selected = selected
+        v.proposed_author = author
+        v.proposed_topic = topic
+        v.proposed_year = str(year)
     
     # Count selected
-    selected_count = sum(1 for v in videos if v.selected)
+    selected = [v for v in videos if v.selected]
+    selected_count = len(selected)
     
-    # Preview filename
+    # Preview filename (same names the save phase will use)
     if selected_count > 0:
         st.divider()
         st.subheader("Preview")
-        for v in videos:
-            if v.selected:
-                filename = build_filename(v.proposed_author, v.proposed_topic, v.proposed_year)
-                st.code(f"{v.proposed_author}/{filename}.{{md,docx,json}}")
+        for v, filename in zip(selected, batch_filenames(selected)):
+            st.code(f"{v.proposed_author}/{filename}.{{md,docx,json}}")
     
     # Action buttons
     st.divider()
@@ -273,27 +376,56 @@ def render_processing_phase():
     st.header("⏳ Processing...")
     
     videos = [v for v in st.session_state.pending_videos if v.selected]
-    include_links = CONFIG.get("include_links_default", True)
+    use_cache = st.session_state.get("use_cache", True)
+    
+    # Videos that would build the same name get numbered names, so no two
+    # workers write the same files
+    filenames = batch_filenames(videos)
+    
+    # Output folders may have been moved or deleted since the last batch
+    reset_dir_cache()
+    
+    # Create each author folder once up front. On failure (output folder unwritable
+    # or not mounted) leave it to the worker, which reports it as a failed result.
+    for author in {v.proposed_author for v in videos}:
+        try:
+            ensure_dir(author_dir(OUTPUT_BASE, author))
+        except OSError:
+            pass
     
-    results = []
+    results = [None] * len(videos)
     progress = st.progress(0)
     status = st.empty()
-    
-    for i, video in enumerate(videos):
-        status.text(f"Processing {i+1}/{len(videos)}: {video.title[:50]}...")
-        
-        result = process_and_save_video(video, OUTPUT_BASE, include_links)
-        results.append(result)
-        
-        # Update metrics if available
-        if HAS_GZPQB_UTILS and "metrics" in st.session_state:
-            if result.is_success:
-                st.session_state.metrics.record_task_success()
-                st.session_state.metrics.files_created += 3  # md, docx, json
-            else:
-                st.session_state.metrics.record_task_failure()
-        
-        progress.progress((i + 1) / len(videos))
+    last_update = 0.0
+    
+    # Transcript download + file writes are independent per video: run them concurrently,
+    # handling results and metrics on the script thread as each one completes
+    with ThreadPoolExecutor(max_workers=max(1, min(len(videos), MAX_WORKERS))) as ex:
+        futures = {
+            ex.submit(
+                process_and_save_video, video, OUTPUT_BASE, filename, INCLUDE_LINKS_DEFAULT, use_cache
+            ): i
+            for i, (video, filename) in enumerate(zip(videos, filenames))
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            result = future.result()
+            results[i] = result
+            
+            # Update metrics if available
+            if HAS_GZPQB_UTILS and "metrics" in st.session_state:
+                if result.is_success:
+                    st.session_state.metrics.record_task_success()
+                    st.session_state.metrics.files_created += 3  # md, docx, json
+                else:
+                    st.session_state.metrics.record_task_failure()
+            
+            # Throttle widget updates; each one is a round-trip to the browser
+            now = time.monotonic()
+            if now - last_update > PROGRESS_INTERVAL or done == len(videos):
+                status.text(f"Processed {done}/{len(videos)}: {videos[i].title[:50]}...")
+                progress.progress(done / len(videos))
+                last_update = now
     
     progress.empty()
     status.empty()
@@ -308,8 +440,9 @@ def render_complete_phase():
     st.header("✅ Complete")
     
     results = st.session_state.results
-    success = [r for r in results if r.is_success]
-    failed = [r for r in results if not r.is_success]
+    success, failed = [], []
+    for r in results:
+        (success if r.is_success else failed).append(r)
     
     # Summary metrics
     if HAS_GZPQB_UTILS and "metrics" in st.session_state:
@@ -370,6 +503,17 @@ def render_sidebar():
         
         st.divider()
         
+        st.toggle(
+            "Use cache",
+            value=True,
+            key="use_cache",
+            help="Reuse metadata and transcripts fetched in the last 24h "
+                 "($XDG_CACHE_HOME/yt-transcriber, default ~/.cache/yt-transcriber). "
+                 "Turn off to download fresh copies."
+        )
+        
+        st.divider()
+        
         # Phase indicator
         phase_labels = {
             "input": "1️⃣ Input URLs",